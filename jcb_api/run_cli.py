@@ -1,18 +1,24 @@
 import os
 import argparse
-import django
-import pandas as pd
+from functools import lru_cache
 
-# --- bootstrap Django ---
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "funderly.settings")
-django.setup()
 
-from jcb_bond_project.models import Instrument, InstrumentData
+# --- bootstrap Django (on first use, so `--help` doesn't pay for it) ---
+@lru_cache(maxsize=None)
+def _models():
+    import django
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "funderly.settings")
+    django.setup()
+
+    from jcb_bond_project.models import Instrument, InstrumentData
+    return Instrument, InstrumentData
 
 
 # ------------ commands ------------
 
 def list_instruments():
+    import pandas as pd
+    Instrument, _ = _models()
     qs = Instrument.objects.all().values("isin", "short_code", "name", "instrument_type")
     df = pd.DataFrame.from_records(qs)
     if df.empty:
@@ -22,6 +28,8 @@ def list_instruments():
 
 
 def show_instrument(isin):
+    import pandas as pd
+    Instrument, _ = _models()
     try:
         inst = Instrument.objects.get(isin=isin)
         df = pd.DataFrame(inst.__dict__.items(), columns=["Field", "Value"])
@@ -30,17 +38,40 @@ def show_instrument(isin):
         print(f"❌ Instrument with ISIN {isin} not found.")
 
 
-def show_history(isin):
-    qs = InstrumentData.objects.filter(instrument_id=isin).order_by("data_date")
-    df = pd.DataFrame.from_records(qs.values("data_date", "data_type", "value"))
-    if df.empty:
-        print(f"❌ No data found for ISIN {isin}.")
+def _positive_int(value):
+    """argparse type for --tail: an integer >= 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return n
+
+
+def show_history(isin, tail=None):
+    _, InstrumentData = _models()
+    qs = InstrumentData.objects.filter(instrument_id=isin).values_list("data_date", "data_type", "value")
+    if tail is not None:
+        # newest N straight off the (instrument_id, data_date, ...) unique index, then oldest-first
+        rows = list(qs.order_by("-data_date")[:tail])[::-1]
     else:
-        print(df.to_string(index=False))
+        # stream instead of materialising years of history into one DataFrame/string
+        rows = qs.order_by("data_date").iterator(chunk_size=2000)
+
+    printed = 0
+    for data_date, data_type, value in rows:
+        if not printed:
+            print(f"{'data_date':<12} {'data_type':<20} value")
+        print(f"{data_date!s:<12} {data_type:<20} {value}")
+        printed += 1
+    if not printed:
+        print(f"❌ No data found for ISIN {isin}.")
 
 
 def validate_schema():
     print("ℹ️ Using Django ORM schema validation")
+    _models()
     # This checks if migrations match the database
     from django.core.management import call_command
     call_command("migrate", check=True, plan=True)
@@ -59,6 +90,7 @@ if __name__ == "__main__":
 
     hist_parser = subparsers.add_parser("show-history", help="Show time-series data for an instrument")
     hist_parser.add_argument("isin", help="ISIN of the instrument")
+    hist_parser.add_argument("--tail", type=_positive_int, metavar="N", help="Only show the latest N rows")
 
     subparsers.add_parser("validate-schema", help="Check if DB schema is up to date with migrations")
 
@@ -69,7 +101,7 @@ if __name__ == "__main__":
     elif args.command == "show-instrument":
         show_instrument(args.isin)
     elif args.command == "show-history":
-        show_history(args.isin)
+        show_history(args.isin, tail=args.tail)
     elif args.command == "validate-schema":
         validate_schema()
     else:
@@ -1,9 +1,12 @@
 # database/insert.py
 
+import csv
+import io
 import json
-from dataclasses import asdict
+from itertools import islice
+from dataclasses import asdict, fields as dc_fields
 from datetime import date, datetime
-from typing import Any, Dict, Iterable, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
 
 import psycopg2
 from psycopg2.extras import execute_values
@@ -23,6 +26,48 @@ def _iso(x) -> Optional[str]:
         return x.isoformat()
     return str(x)
 
+def _upsert_sql(table: str, cols: Sequence[str], conflict_cols: Sequence[str], values: str) -> str:
+    """INSERT ... ON CONFLICT DO UPDATE for every non-key column (no delete + reinsert)."""
+    updates = ", ".join(f"{c}=EXCLUDED.{c}" for c in cols if c not in conflict_cols)
+    return f"""
+        INSERT INTO {table} ({", ".join(cols)})
+        {values}
+        ON CONFLICT ({", ".join(conflict_cols)})
+        DO UPDATE SET {updates}
+    """
+
+# Column lists follow the dataclass field order; SQL text is built once at import
+_INSTRUMENT_COLS = tuple(f.name for f in dc_fields(Instrument))
+_DATA_COLS = tuple(f.name for f in dc_fields(InstrumentData))
+_DATA_CONFLICT_COLS = ("instrument_id", "data_date", "data_type", "source", "resolution")
+
+def _named_placeholders(cols: Sequence[str]) -> str:
+    return "(" + ", ".join(f"%({c})s" for c in cols) + ")"
+
+_UPSERT_INSTRUMENT_SQL = _upsert_sql(
+    "instruments_instrument", _INSTRUMENT_COLS, ("isin",), "VALUES " + _named_placeholders(_INSTRUMENT_COLS)
+)
+_UPSERT_INSTRUMENTS_MANY_SQL = _upsert_sql("instruments_instrument", _INSTRUMENT_COLS, ("isin",), "VALUES %s")
+_UPSERT_DATA_SQL = _upsert_sql(
+    "instruments_instrumentdata", _DATA_COLS, _DATA_CONFLICT_COLS, "VALUES " + _named_placeholders(_DATA_COLS)
+)
+_UPSERT_DATA_MANY_SQL = _upsert_sql("instruments_instrumentdata", _DATA_COLS, _DATA_CONFLICT_COLS, "VALUES %s")
+
+# COPY staging for large loads: temp table with the instrument_data columns, no constraints
+_STAGE_TABLE = "_stage_instrumentdata"
+_CREATE_STAGE_SQL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {_STAGE_TABLE} ON COMMIT DROP AS
+    SELECT {", ".join(_DATA_COLS)} FROM instruments_instrumentdata WITH NO DATA
+"""
+_COPY_STAGE_SQL = f"COPY {_STAGE_TABLE} ({', '.join(_DATA_COLS)}) FROM STDIN WITH (FORMAT csv)"
+# DISTINCT ON keeps one row per conflict key (ctid DESC: the last one copied)
+_MERGE_STAGE_SQL = _upsert_sql(
+    "instruments_instrumentdata", _DATA_COLS, _DATA_CONFLICT_COLS,
+    f"""SELECT DISTINCT ON ({", ".join(_DATA_CONFLICT_COLS)}) {", ".join(_DATA_COLS)}
+        FROM {_STAGE_TABLE}
+        ORDER BY {", ".join(_DATA_CONFLICT_COLS)}, ctid DESC""",
+)
+
 def _instrument_to_params(inst: Instrument) -> Dict[str, Any]:
     d = asdict(inst)
     for k, v in list(d.items()):
@@ -36,20 +81,24 @@ def _instrument_to_params(inst: Instrument) -> Dict[str, Any]:
 def save_instrument(conn, instrument: Instrument) -> str:
     """Upsert an instrument by ISIN."""
     params = _instrument_to_params(instrument)
-    cols = ", ".join(params.keys())
-    placeholders = ", ".join([f"%({k})s" for k in params.keys()])
-    updates = ", ".join([f"{k}=EXCLUDED.{k}" for k in params.keys() if k != "isin"])
-
-    sql = f"""
-        INSERT INTO instruments_instrument ({cols})
-        VALUES ({placeholders})
-        ON CONFLICT (isin) DO UPDATE SET {updates}
-    """
     with conn.cursor() as cur:
-        cur.execute(sql, params)
+        cur.execute(_UPSERT_INSTRUMENT_SQL, params)
     return "inserted_or_updated"
 
 
+def save_instruments_many(conn, instruments: Iterable[Instrument], *, page_size: int = 1000) -> int:
+    """Upsert many instruments by ISIN with execute_values. Returns the number of rows written."""
+    # Last instrument wins when an ISIN repeats (one ON CONFLICT hit per key per statement)
+    by_isin = {inst.isin: _instrument_to_params(inst) for inst in instruments}
+    if not by_isin:
+        return 0
+
+    rows = [tuple(by_isin[isin][c] for c in _INSTRUMENT_COLS) for isin in sorted(by_isin)]
+    with conn.cursor() as cur:
+        execute_values(cur, _UPSERT_INSTRUMENTS_MANY_SQL, rows, page_size=page_size)
+    return len(by_isin)
+
+
 # ------------ data type normalisation ------------
 
 def normalise_data_type(conn, source: str, raw_type: str) -> Tuple[str, Optional[str]]:
@@ -87,21 +136,97 @@ def insert_instrument_data(conn, instrument_data: InstrumentData) -> str:
         "attrs": json.dumps(instrument_data.attrs or {}, separators=(",", ":")),
     }
 
-    cols = ", ".join(fields.keys())
-    placeholders = ", ".join([f"%({k})s" for k in fields.keys()])
-    updates = ", ".join([
-        f"{k}=EXCLUDED.{k}"
-        for k in fields.keys()
-        if k not in ("instrument_id","data_date","data_type","source","resolution")
-    ])
-
-    sql = f"""
-        INSERT INTO instruments_instrumentdata ({cols})
-        VALUES ({placeholders})
-        ON CONFLICT (instrument_id, data_date, data_type, source, resolution)
-        DO UPDATE SET {updates}
-    """
     with conn.cursor() as cur:
-        cur.execute(sql, fields)
+        cur.execute(_UPSERT_DATA_SQL, fields)
     return "inserted_or_updated"
 
+
+
+# ------------ instrument_data (batched) ------------
+
+def upsert_instrument_data_rows(
+    conn,
+    rows: Iterable[tuple],
+    *,
+    page_size: int = 1000,
+    chunk_size: int = 10_000,
+) -> int:
+    """
+    Bulk path for callers that already hold normalised rows: tuples in _DATA_COLS order
+    (instrument_id, data_date, data_type, value, source, resolution, unit, attrs_json).
+    No InstrumentData objects and no data_type lookup; rows are consumed `chunk_size` at a time.
+    Returns the number of rows written (duplicates within a chunk collapse to the last one).
+    """
+    rows = iter(rows)
+    written = 0
+
+    with conn.cursor() as cur:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            # ON CONFLICT DO UPDATE cannot touch the same key twice in one statement
+            by_key = {(r[0], r[1], r[2], r[4], r[5]): r for r in chunk}
+
+            # Send rows in conflict-key order so the unique index is filled sequentially
+            # (the index backs ON CONFLICT, so it can't be dropped and rebuilt around the load)
+            ordered = [by_key[k] for k in sorted(by_key, key=lambda k: tuple("" if x is None else str(x) for x in k))]
+            execute_values(cur, _UPSERT_DATA_MANY_SQL, ordered, page_size=page_size)
+            written += len(by_key)
+
+    return written
+
+
+def copy_instrument_data_rows(conn, rows: Iterable[tuple]) -> int:
+    """
+    Large-load variant of upsert_instrument_data_rows (same tuple layout): COPY the rows
+    into a temp staging table, then merge with a single INSERT ... SELECT ... ON CONFLICT.
+    Runs inside the caller's transaction; the staging table is dropped on commit.
+    Returns the number of rows written.
+    """
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)  # None -> empty unquoted field -> NULL
+    buf.seek(0)
+
+    with conn.cursor() as cur:
+        cur.execute(_CREATE_STAGE_SQL)
+        cur.execute(f"TRUNCATE {_STAGE_TABLE}")
+        cur.copy_expert(_COPY_STAGE_SQL, buf)
+        cur.execute(_MERGE_STAGE_SQL)
+        return cur.rowcount
+
+
+def insert_instrument_data_many(
+    conn,
+    records: Iterable[InstrumentData],
+    *,
+    page_size: int = 1000,
+    chunk_size: int = 10_000,
+) -> int:
+    """
+    Upsert many InstrumentData rows with execute_values inside the caller's transaction.
+    data_type normalisation is looked up once per distinct (source, data_type).
+    Returns the number of rows written (see upsert_instrument_data_rows).
+    """
+    type_cache: Dict[Tuple[str, str], Tuple[str, Optional[str]]] = {}
+
+    def _rows():
+        for rec in records:
+            type_key = (rec.source, rec.data_type)
+            if type_key not in type_cache:
+                type_cache[type_key] = normalise_data_type(conn, rec.source, rec.data_type)
+            canonical_type, default_unit = type_cache[type_key]
+
+            yield (  # same order as _DATA_COLS
+                rec.instrument_id,
+                _iso(rec.data_date),
+                canonical_type,
+                rec.value,
+                rec.source,
+                rec.resolution,
+                rec.unit or default_unit,
+                json.dumps(rec.attrs or {}, separators=(",", ":")),
+            )
+
+    return upsert_instrument_data_rows(conn, _rows(), page_size=page_size, chunk_size=chunk_size)
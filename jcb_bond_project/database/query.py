@@ -33,20 +33,23 @@ def _coerce_date(x):
     except Exception:
         return None
 
+# Computed once: dataclass reflection per row showed up when hydrating whole result sets
+_INSTRUMENT_FIELDS = frozenset(f.name for f in fields(Instrument))
+_BOOL_FIELDS = ("is_green", "is_linker")
+_DATE_FIELDS = ("maturity_date", "first_issue_date")
+
 def _row_to_instrument(row_dict: Dict[str, Any]) -> Instrument:
     """Convert DB row dict -> Instrument dataclass"""
-    data = dict(row_dict)
+    kwargs = {k: v for k, v in row_dict.items() if k in _INSTRUMENT_FIELDS}
 
-    for k in ("is_green", "is_linker"):
-        if k in data:
-            data[k] = _coerce_bool(data[k])
+    for k in _BOOL_FIELDS:
+        if k in kwargs:
+            kwargs[k] = _coerce_bool(kwargs[k])
 
-    for k in ("maturity_date", "first_issue_date", "issue_date"):
-        if k in data:
-            data[k] = _coerce_date(data[k])
+    for k in _DATE_FIELDS:
+        if k in kwargs:
+            kwargs[k] = _coerce_date(kwargs[k])
 
-    inst_field_names = {f.name for f in fields(Instrument)}
-    kwargs = {k: v for k, v in data.items() if k in inst_field_names}
     return Instrument(**kwargs)
 
 
@@ -179,6 +182,8 @@ def list_instruments(
     is_green: Optional[bool] = None,
     is_linker: Optional[bool] = None,
     like: Optional[str] = None,
+    maturity_min: Optional[date] = None,
+    maturity_max: Optional[date] = None,
     order_by: str = "instrument_type, name, isin",
     limit: Optional[int] = None,
 ) -> List[Instrument]:
@@ -206,6 +211,15 @@ def list_instruments(
         needle = f"%{like}%"
         params.extend([needle, needle, needle])
 
+    # inclusive maturity window; instruments without a maturity never match a bound
+    if maturity_min is not None:
+        sql_parts.append("AND maturity_date >= %s")
+        params.append(maturity_min)
+
+    if maturity_max is not None:
+        sql_parts.append("AND maturity_date <= %s")
+        params.append(maturity_max)
+
     sql_parts.append(f"ORDER BY {order_by}")
     if limit:
         sql_parts.append("LIMIT %s")
@@ -274,3 +288,25 @@ def get_latest_data(conn, instrument_id: str, data_type: str, as_of: date):
         row = cur.fetchone()
         return float(row[0]) if row else None
 
+
+def get_latest_data_many(
+    conn, instrument_ids: Sequence[str], data_type: str, as_of: date
+) -> Dict[str, float]:
+    """
+    Batched get_latest_data: one query for many instruments.
+
+    Returns:
+        dict of instrument_id -> latest value (<= as_of); ids with no data are absent
+    """
+    if not instrument_ids:
+        return {}
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT ON (instrument_id) instrument_id, value
+            FROM instruments_instrumentdata
+            WHERE instrument_id = ANY(%s)
+              AND data_type = %s
+              AND data_date <= %s
+            ORDER BY instrument_id, data_date DESC
+        """, (list(instrument_ids), data_type, as_of))
+        return {r[0]: float(r[1]) for r in cur.fetchall()}
@@ -1,11 +1,11 @@
 import os
+import time
 from datetime import date, datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import pandas as pd
 import numpy as np
 import pathlib
 
-from dateutil.relativedelta import relativedelta
 
 from jcb_bond_project.models.instrument import Instrument
 from jcb_bond_project.database.db import get_conn
@@ -14,7 +14,7 @@ from jcb_bond_project.utils.jcb_calendar import BusinessDayCalendar
 from jcb_bond_project.portfolio.portfolio_optimiser import solve_portfolio_weights
 from jcb_bond_project.cashflow_model.builders import cashflows_from_instrument
 
-from jcb_bond_project.database.query import get_latest_data
+from jcb_bond_project.database.query import get_latest_data_many
 from jcb_bond_project.utils.settlement import get_settlement_date
 
 
@@ -22,6 +22,58 @@ from jcb_bond_project.utils.settlement import get_settlement_date
 # Get DB connection string (Postgres on Render, fallback to SQLite locally)
 DB_PATH = os.getenv("DATABASE_URL", "jcb_db.db")
 
+# Holiday calendars and the bond universe rarely change: keep them for CALENDAR_CACHE_TTL seconds
+CALENDAR_CACHE_TTL = float(os.getenv("JCB_CALENDAR_CACHE_TTL", "3600"))
+_calendar_cache: Dict[str, Tuple[float, BusinessDayCalendar]] = {}
+_universe_cache: Dict[Tuple[str, bool, bool], Tuple[float, Tuple[Instrument, ...], BusinessDayCalendar]] = {}
+
+def _get_calendar(conn, country: str) -> BusinessDayCalendar:
+    """Return the cached BusinessDayCalendar for `country`, loading holidays via `conn` on a miss."""
+    now = time.monotonic()
+    cached = _calendar_cache.get(country)
+    if cached is not None and now - cached[0] < CALENDAR_CACHE_TTL:
+        return cached[1]
+    calendar = BusinessDayCalendar(get_holidays_for_calendar(conn, country))
+    _calendar_cache[country] = (now, calendar)
+    return calendar
+
+def _get_universe(
+    conn, country: str, is_green: bool, is_linker: bool
+) -> Tuple[Tuple[Instrument, ...], BusinessDayCalendar]:
+    """
+    Return (bonds, calendar) for the filter combination, cached per (country, is_green, is_linker).
+    Bonds come back as a tuple so the shared cache entry can't be mutated by a caller.
+    """
+    key = (country, is_green, is_linker)
+    now = time.monotonic()
+    cached = _universe_cache.get(key)
+    if cached is not None and now - cached[0] < CALENDAR_CACHE_TTL:
+        return cached[1], cached[2]
+    # Bonds maturing before settlement have no cashflows on the timeline, so don't hydrate them.
+    # The lower bound only grows over time, so a stale entry is a superset; the per-request
+    # window is still applied by filter_bonds_by_maturity.
+    bonds = tuple(list_instruments(
+        conn,
+        instrument_types=["bond"],
+        country=country,
+        is_green=is_green,
+        is_linker=is_linker,
+        maturity_min=get_settlement_date(),
+    ))
+    calendar = _get_calendar(conn, country)
+    _universe_cache[key] = (now, bonds, calendar)
+    return bonds, calendar
+
+def clear_calendar_cache() -> None:
+    """Drop cached calendars and bond universes (e.g. after loading new holidays or bonds)."""
+    _calendar_cache.clear()
+    _universe_cache.clear()
+
+def _debug_dump(df: pd.DataFrame, filename: str, **kwargs) -> None:
+    """Write a debug snapshot only when JCB_DEBUG_DUMP is set (skipped on the request path)."""
+    if os.getenv("JCB_DEBUG_DUMP"):
+        df.to_csv(filename, sep="\t", **kwargs)
+
 def cashflows_df(
     instruments: List[Instrument],
     *,
@@ -32,13 +84,16 @@ def cashflows_df(
     first_coupon_dates: Optional[Dict[str, date]] = None,
 ) -> pd.DataFrame:
     first_coupon_dates = first_coupon_dates or {}
+    # Calendars with adjust_many roll every date in one numpy call after the loop;
+    # the schedules themselves are then generated unadjusted
+    bulk_roll = calendar is not None and hasattr(calendar, "adjust_many")
     rows: List[Dict[str, Any]] = []
     for inst in instruments:
         if (inst.instrument_type or "").strip().lower() != "bond":
             continue
         for r in cashflows_from_instrument(
             inst,
-            calendar=calendar,
+            calendar=None if bulk_roll else calendar,
             frequency=frequency,
             notional=notional,
             convention=convention,
@@ -49,14 +104,17 @@ def cashflows_df(
                 "short_code": inst.short_code,
                 "maturity_date": inst.maturity_date,
                 "cashflow_date": r.adjusted_date,  # business-day rolled if calendar provided
-                "coupon": float(r.coupon_amount),
-                "principal": float(r.principal),
-                "amount": float(r.coupon_amount + r.principal),
-                "is_stub": bool(r.is_stub),
-                "accrual_factor": float(r.accrual_factor),
+                # CashflowRow already holds floats/bools; let pandas infer dtypes once
+                "coupon": r.coupon_amount,
+                "principal": r.principal,
+                "is_stub": r.is_stub,
+                "accrual_factor": r.accrual_factor,
             })
     df = pd.DataFrame(rows)
     if not df.empty:
+        if bulk_roll:
+            df["cashflow_date"] = calendar.adjust_many(df["cashflow_date"], convention).astype(object)
+        df.insert(df.columns.get_loc("principal") + 1, "amount", df["coupon"] + df["principal"])
         df = df.sort_values(["cashflow_date", "maturity_date"], kind="mergesort").reset_index(drop=True)
     return df
 
@@ -64,19 +122,22 @@ def cashflow_matrix(df_long: pd.DataFrame) -> pd.DataFrame:
     if df_long.empty:
         return pd.DataFrame()
 
-    # Pivot into wide format
-    mat = (
-        df_long
-        .pivot_table(
-            index="cashflow_date",
-            columns="instrument_id",
-            values="amount",
-            aggfunc="sum",
-            fill_value=0.0
-        )
-        .sort_index()
+    # Pivot into wide format by direct indexing (no groupby/hash aggregation)
+    row_codes, dates = pd.factorize(df_long["cashflow_date"], sort=True)
+    col_codes, ids = pd.factorize(df_long["instrument_id"], sort=True)
+    amounts = df_long["amount"].to_numpy(dtype=float)
+
+    values = np.zeros((len(dates), len(ids)))
+    if df_long.duplicated(["cashflow_date", "instrument_id"]).any():
+        np.add.at(values, (row_codes, col_codes), amounts)
+    else:
+        values[row_codes, col_codes] = amounts  # typical case: one cashflow per (date, bond)
+
+    mat = pd.DataFrame(
+        values,
+        index=pd.Index(dates, name="cashflow_date"),
+        columns=pd.Index(ids),
     )
-    mat.columns.name = None
 
     # Reorder columns by maturity
     if "maturity_date" in df_long.columns:
@@ -114,22 +175,17 @@ def generate_target_cashflows(
         target_end_date = target_end_date.date()
 
     if frequency == "monthly":
-        delta = relativedelta(months=1)
+        delta = pd.DateOffset(months=1)
     elif frequency == "annually":
-        delta = relativedelta(years=1)
+        delta = pd.DateOffset(years=1)
     else:
         raise ValueError("Frequency must be 'monthly' or 'annually'")
 
-    cashflow_dates = []
-    current_date = target_start_date
-    while current_date <= target_end_date:
-        cashflow_dates.append(current_date)
-        current_date += delta
+    # Same stepping as repeatedly adding the offset, but generated in one call.
+    # (An anchored freq like 'MS' would snap to month starts, so keep the DateOffset.)
+    cashflow_dates = pd.date_range(start=target_start_date, end=target_end_date, freq=delta)
 
-    return (
-        pd.DataFrame({"target": [target_amount] * len(cashflow_dates)}, index=pd.to_datetime(cashflow_dates))
-        .rename_axis("cashflow_date")
-    )
+    return pd.DataFrame({"target": target_amount}, index=cashflow_dates.rename("cashflow_date"))
 
 def filter_bonds_by_maturity(
     bonds: List[object],
@@ -153,22 +209,23 @@ def filter_bonds_by_maturity(
     if isinstance(select_end_date, datetime):
         select_end_date = select_end_date.date()
 
-    def to_date(d: date | datetime | None) -> date | None:
+    def to_ordinal(d: date | datetime | None) -> int:
         if d is None:
-            return None
-        return d.date() if isinstance(d, datetime) else d
-
-    # Filter bonds
-    filtered = [
-        bond for bond in bonds
-        if (maturity := to_date(getattr(bond, "maturity_date", None)))
-        and select_start_date <= maturity <= select_end_date
-    ]
-
-    # Sort by maturity date
-    filtered.sort(key=lambda b: to_date(getattr(b, "maturity_date", None)))
+            return -1  # never inside a valid window
+        return (d.date() if isinstance(d, datetime) else d).toordinal()
+
+    # One pass to collect maturities, then filter and sort on the ordinal array
+    mats = np.fromiter(
+        (to_ordinal(getattr(bond, "maturity_date", None)) for bond in bonds),
+        dtype=np.int64,
+        count=len(bonds),
+    )
+    keep = np.flatnonzero(
+        (mats >= select_start_date.toordinal()) & (mats <= select_end_date.toordinal())
+    )
+    order = keep[np.argsort(mats[keep], kind="stable")]
 
-    return filtered
+    return [bonds[i] for i in order]
 
 def calculate_running_totals(cashflow_matrix: pd.DataFrame) -> pd.DataFrame:
     """
@@ -183,7 +240,12 @@ def calculate_running_totals(cashflow_matrix: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Matrix of running totals with the same shape, index, and columns.
     """
-    return cashflow_matrix.cumsum(axis=0)
+    # Single cumsum over the underlying ndarray (skips DataFrame.cumsum's per-block dispatch)
+    return pd.DataFrame(
+        np.cumsum(cashflow_matrix.to_numpy(dtype=float), axis=0),
+        index=cashflow_matrix.index,
+        columns=cashflow_matrix.columns,
+    )
 
 # bond_project/portfolio/portfolio_optimiser.py
 
@@ -249,43 +311,34 @@ def build_portfolio(
 ) -> dict:
     """Construct portfolio weights for target cashflows."""
 
-    # 1. Load and filter bonds
+    # 1-4. One connection for bonds, holidays and prices (each connect is a round-trip on Postgres)
     with get_conn(DB_PATH) as conn:
-        bonds = list_instruments(
-            conn,
-            instrument_types=["bond"],
-            country=country,
-            is_green=is_green,
-            is_linker=is_linker,
-        )
-        uk = BusinessDayCalendar(set(get_holidays_for_calendar(conn, country)))
+        # 1. Load bonds + calendar (cached across calls)
+        bonds, uk = _get_universe(conn, country, is_green, is_linker)
 
-    if not bonds:
-        raise ValueError("No bonds found in database for given filters")
+        if not bonds:
+            raise ValueError("No bonds found in database for given filters")
 
-    # 2. Filter bonds by maturity
-    filtered_bonds = filter_bonds_by_maturity(bonds, settlement_date, select_end_date)
-    if not filtered_bonds:
-        raise ValueError("No bonds found matching maturity criteria")
+        # 2. Filter bonds by maturity
+        filtered_bonds = filter_bonds_by_maturity(bonds, settlement_date, select_end_date)
+        if not filtered_bonds:
+            raise ValueError("No bonds found matching maturity criteria")
 
-    # 3. Settlement date from env var (or default today+1)
-    settlement_date = get_settlement_date()
+        # 3. Settlement date from env var (or default today+1)
+        settlement_date = get_settlement_date()
 
-    # 4. Query latest dirty prices for each bond
-    with get_conn(DB_PATH) as conn:
-        prices = []
-        for bond in filtered_bonds:
-            price = get_latest_data(
-                conn,
-                instrument_id=bond.isin,
-                data_type="dirty_price",
-                as_of=settlement_date,
-            )
-            if price is None:
-                raise ValueError(f"No dirty price found for {bond.isin} as of {settlement_date}")
-            prices.append(price)
-
-    prices = np.array(prices)
+        # 4. Query latest dirty prices for all bonds in one round-trip
+        latest = get_latest_data_many(
+            conn,
+            [bond.isin for bond in filtered_bonds],
+            data_type="dirty_price",
+            as_of=settlement_date,
+        )
+
+    missing = [bond.isin for bond in filtered_bonds if bond.isin not in latest]
+    if missing:
+        raise ValueError(f"No dirty price found for {missing[0]} as of {settlement_date}")
+    prices = np.array([latest[bond.isin] for bond in filtered_bonds])
 
     # 5. Generate bond cashflows
     cf_long = cashflows_df(filtered_bonds, calendar=uk)
@@ -298,19 +351,23 @@ def build_portfolio(
 
     # 7. Create unified timeline (bonds + target aligned)
     unified_cf = create_unified_timeline(cf_target, cf_mat, settlement_date)
-    # unified_cf.to_csv("debug_unified_cf.txt", sep="\t")
+    _debug_dump(unified_cf, "debug_unified_cf.txt")
 
     # 8. Running totals
     unified_running = calculate_running_totals(unified_cf)
-    # unified_running.to_csv("debug_unified_running.txt", sep="\t")
+    _debug_dump(unified_running, "debug_unified_running.txt")
 
     # 9. Solve optimisation problem
-    # 9a. Split into target and bonds
-    Y_running = unified_running["target"].values
-    C_matrix = unified_running.drop("target", axis=1).values
+    # 9a. Split into target and bonds: create_unified_timeline puts 'target' first, so slice
+    # views off one ndarray instead of copying every bond column through drop()
+    running = unified_running.to_numpy(dtype=float)
+    Y_running = running[:, 0]
+    C_matrix = running[:, 1:]
 
     # 9b. Solve nominal weights - note that nominal_weights is returned as % wieghts
-    nominal_weights = solve_portfolio_weights(C_matrix, Y_running)
+    nominal_weights, predicted_unit = solve_portfolio_weights(
+        C_matrix, Y_running, return_prediction=True
+    )
 
     # 9c. Scale weights to match user budget
     total_cost = np.sum(nominal_weights * prices)
@@ -320,24 +377,28 @@ def build_portfolio(
     port_total_nominal = amount / total_cost
     bond_nominals = nominal_weights * port_total_nominal
 
-    # 9d. Recompute predicted running totals with scaled weights
-    predicted_running = C_matrix @ bond_nominals
+    # 9d. Predicted running totals with scaled weights (linear in weights, so rescale)
+    predicted_running = predicted_unit * port_total_nominal
+
+    # DEBUG: export predicted running with dates (only when JCB_DEBUG_DUMP is set)
+    if os.getenv("JCB_DEBUG_DUMP"):
+        _debug_dump(
+            pd.DataFrame({"date": unified_running.index, "predicted_running": predicted_running}),
+            "debug_predicted_running.txt",
+            index=False,
+        )
 
-    # DEBUG: export predicted running with dates
-    pd.DataFrame({
-        "date": unified_running.index,
-        "predicted_running": predicted_running
-    }).to_csv("debug_predicted_running.txt", sep="\t", index=False)
-    
     # Rescale target so it ends at the same level as predicted
     target_running = Y_running * (predicted_running[-1] / Y_running[-1])
     residuals = target_running - predicted_running
 
     # 9e. Diagnostics
-    mse = float(np.mean(residuals**2))
-    r_squared = float(
-        1 - np.sum(residuals**2) / np.sum((Y_running - np.mean(Y_running))**2)
-    )
+    # sums of squares as dot products: one fused multiply-add pass each, no squared temporaries
+    ss_res = residuals @ residuals
+    centred = Y_running - Y_running.mean()
+    ss_tot = centred @ centred
+    mse = float(ss_res / residuals.size)
+    r_squared = float(1 - ss_res / ss_tot)
 
     # 10. Build weights DataFrame
     bond_weights_df = pd.DataFrame({
@@ -403,17 +464,19 @@ def build_portfolio_json(
     weights["nominal_weight"] = weights["nominal_weight"] * 100
     weights_dicts = weights.to_dict(orient="records")
 
-    # Add explicit portfolio_total column
+    # portfolio_total / target_running columns are already on the running-totals frame;
+    # read them as plain arrays instead of boxing every row with iterrows()
     df = result["unified_running_totals"]
+    dates = df.index.strftime("%Y-%m-%d").tolist()
+    portfolio_total = df["portfolio_total"].to_numpy(dtype=float).tolist()
+    target_running = df["target_running"].to_numpy(dtype=float).tolist()
 
     cashflows = {
         "portfolio": [
-            {"date": d.strftime("%Y-%m-%d"), "cumulative": float(row["portfolio_total"])}
-            for d, row in df.iterrows()
+            {"date": d, "cumulative": v} for d, v in zip(dates, portfolio_total)
         ],
         "target": [
-            {"date": d.strftime("%Y-%m-%d"), "cumulative": float(row["target_running"])}
-            for d, row in df.iterrows()
+            {"date": d, "cumulative": v} for d, v in zip(dates, target_running)
         ],
     }
 
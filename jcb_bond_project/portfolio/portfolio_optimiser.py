@@ -7,24 +7,51 @@ from jcb_bond_project.models.instrument import Instrument
 from jcb_bond_project.cashflow_model.conv_bond_model import CashflowModel, CashflowRow
 from dateutil.relativedelta import relativedelta
 
+# LAPACK Cholesky (potrf/potrs) from the `fast` extra; np.linalg.solve (LU) otherwise
+try:
+    from scipy.linalg import cho_factor, cho_solve
+    HAVE_SCIPY = True
+except ImportError:
+    HAVE_SCIPY = False
 
-def solve_portfolio_weights(C_matrix, Y_vector):
+# Normal equations only pay off for tall systems (dates >> bonds); below this use lstsq
+TALL_RATIO = 4
+
+
+def solve_portfolio_weights(C_matrix, Y_vector, return_prediction: bool = False):
     """
     Solve for portfolio weights as fractions (sum = 1).
     Assumes the target cashflows have been generated
     with a dummy value of 100 per period.
+
+    If return_prediction is True, returns (weights, C_matrix @ weights) so callers
+    can rescale the prediction instead of multiplying C_matrix again.
     """
     import numpy as np
 
-    C_transpose = C_matrix.T
-    CTc = C_transpose @ C_matrix
-    CTy = C_transpose @ Y_vector
-    try:
-        weights = np.linalg.solve(CTc, CTy)
-    except np.linalg.LinAlgError:
+    weights = None
+    n_rows, n_cols = C_matrix.shape
+    if n_rows > TALL_RATIO * n_cols:
+        C_transpose = C_matrix.T
+        CTc = C_transpose @ C_matrix
+        CTy = C_transpose @ Y_vector
+        try:
+            if HAVE_SCIPY:
+                # Gram matrix is symmetric positive definite unless C is rank-deficient
+                factor = cho_factor(CTc, overwrite_a=True, check_finite=False)
+                weights = cho_solve(factor, CTy, check_finite=False)
+            else:
+                weights = np.linalg.solve(CTc, CTy)
+        except np.linalg.LinAlgError:
+            weights = None
+
+    if weights is None:
+        # short/wide or singular: SVD least squares
         weights, _, _, _ = np.linalg.lstsq(C_matrix, Y_vector, rcond=None)
 
     # Normalise to sum = 1
     weights_norm = weights / weights.sum()
 
+    if return_prediction:
+        return weights_norm, C_matrix @ weights_norm
     return weights_norm
@@ -1,3 +1,7 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
 def generate_jcb_isin(
     currency: str,
     instrument_type: str,
@@ -9,7 +13,5 @@ def generate_jcb_isin(
 
     Example: JCBGBPIRS10YSONIA
     """
-    parts = ["JCB", currency.upper(), instrument_type.upper(), tenor.upper()]
-    if index:
-        parts.append(index.upper())
-    return "".join(parts)
+    base = f"JCB{currency}{instrument_type}{tenor}".upper()
+    return f"{base}{index.upper()}" if index else base
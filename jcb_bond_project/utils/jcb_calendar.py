@@ -1,10 +1,13 @@
 # utils/calendar.py
 from __future__ import annotations
 from datetime import date as _date, datetime, timedelta
-from typing import Iterable, Optional, Set, Literal, Any
+from typing import AbstractSet, FrozenSet, Iterable, Optional, Set, Literal, Any
 from functools import lru_cache
 
+import numpy as np
+
 RollConv = Literal["f", "p", "mf"]  # following, preceding, modified following
+_NP_ROLL = {"f": "following", "p": "preceding", "mf": "modifiedfollowing"}
 
 def _ensure_date(d: Any) -> _date:
     """
@@ -19,7 +22,7 @@ def _ensure_date(d: Any) -> _date:
     return d
 
 # ---- keep your existing function, now with guards ----
-def adjust_to_business_day(d, holidays: Set[_date], convention: RollConv = "f") -> _date:
+def adjust_to_business_day(d, holidays: AbstractSet[_date], convention: RollConv = "f") -> _date:
     d = _ensure_date(d)
 
     @lru_cache(maxsize=256_000)
@@ -57,16 +60,61 @@ class BusinessDayCalendar:
         holidays: iterable of datetime.date
         weekend: set of weekday ints treated as weekend (default {5,6} => Sat/Sun)
         """
-        self.holidays: Set[_date] = { _ensure_date(h) for h in holidays }
-        self.weekend: Set[int] = {5, 6} if weekend is None else set(weekend)
+        # frozensets: a calendar is immutable once built, so cached instances can be shared
+        self.holidays: FrozenSet[_date] = frozenset(_ensure_date(h) for h in holidays)
+        self.weekend: FrozenSet[int] = frozenset({5, 6} if weekend is None else weekend)
+        self._weekend_mask = np.array([wd in self.weekend for wd in range(7)], dtype=bool)
+
+        # Packed holiday bitmap: bit i set <=> (epoch + i days) is a holiday
+        if self.holidays:
+            self._epoch = min(self.holidays).toordinal()
+            span = max(self.holidays).toordinal() - self._epoch + 1
+        else:
+            self._epoch, span = 0, 0
+        self._bitmap = np.zeros((span + 63) // 64, dtype=np.uint64)
+        if span:
+            offsets = np.fromiter((h.toordinal() - self._epoch for h in self.holidays), dtype=np.int64)
+            np.bitwise_or.at(self._bitmap, offsets >> 6, np.left_shift(np.uint64(1), (offsets & 63).astype(np.uint64)))
+        self._span = span
+
+        # numpy business-day calendar for O(1)-in-Python workday / count calls
+        self._np_cal = np.busdaycalendar(
+            weekmask=[0 if wd in self.weekend else 1 for wd in range(7)],
+            holidays=np.array(sorted(self.holidays), dtype="datetime64[D]"),
+        )
 
-    @lru_cache(maxsize=256_000)
     def is_business_day(self, d: _date) -> bool:
+        # plain set probe: per-call numpy scalar indexing is slower than this for single dates
         d = _ensure_date(d)
         return (d.weekday() not in self.weekend) and (d not in self.holidays)
 
+    def are_business_days(self, ordinals: np.ndarray) -> np.ndarray:
+        """Vectorised is_business_day over an array of date ordinals (date.toordinal())."""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        result = ~self._weekend_mask[(ordinals - 1) % 7]
+        off = ordinals - self._epoch
+        in_range = (off >= 0) & (off < self._span)
+        if in_range.any():
+            o = off[in_range]
+            bits = np.bitwise_and(self._bitmap[o >> 6] >> (o & 63).astype(np.uint64), np.uint64(1))
+            result[in_range] &= bits == 0
+        return result
+
     def adjust(self, d: _date, convention: RollConv = "f") -> _date:
-        return adjust_to_business_day(d, self.holidays, convention)
+        d = _ensure_date(d)
+        if convention not in _NP_ROLL:
+            raise ValueError(f"Unsupported convention: {convention!r}")
+        if self.is_business_day(d):
+            return d
+        out = np.busday_offset(np.datetime64(d, "D"), 0, roll=_NP_ROLL[convention], busdaycal=self._np_cal)
+        return out.astype(object)
+
+    def adjust_many(self, dates, convention: RollConv = "f") -> np.ndarray:
+        """Vectorised adjust over an array-like of dates; returns datetime64[D]."""
+        if convention not in _NP_ROLL:
+            raise ValueError(f"Unsupported convention: {convention!r}")
+        days = np.asarray(dates, dtype="datetime64[D]")
+        return np.busday_offset(days, 0, roll=_NP_ROLL[convention], busdaycal=self._np_cal)
 
     def workday(self, start: _date, days: int) -> _date:
         """
@@ -75,29 +123,17 @@ class BusinessDayCalendar:
         - Start date itself is not counted when |days| > 0.
         """
         start = _ensure_date(start)
-        if days == 0:
-            return start if self.is_business_day(start) else self.next_business_day(start)
-
-        step = 1 if days > 0 else -1
-        remaining = abs(days)
-        d = start
-        while remaining:
-            d += timedelta(days=step)
-            if self.is_business_day(d):
-                remaining -= 1
-        return d
+        # Non-business start: roll back before moving forward (and vice versa) so the
+        # start itself is never counted, e.g. workday(Sat, 1) == Mon, workday(Sat, -1) == Fri.
+        roll = "backward" if days > 0 else "forward"
+        out = np.busday_offset(np.datetime64(start, "D"), days, roll=roll, busdaycal=self._np_cal)
+        return out.astype(object)
 
     def next_business_day(self, d: _date) -> _date:
-        d = _ensure_date(d) + timedelta(days=1)
-        while not self.is_business_day(d):
-            d += timedelta(days=1)
-        return d
+        return self.workday(d, 1)
 
     def previous_business_day(self, d: _date) -> _date:
-        d = _ensure_date(d) - timedelta(days=1)
-        while not self.is_business_day(d):
-            d -= timedelta(days=1)
-        return d
+        return self.workday(d, -1)
 
     def shift_business_days(self, d: _date, n: int) -> _date:
         """Alias of workday(d, n)."""
@@ -130,12 +166,14 @@ class BusinessDayCalendar:
             start, end = b, a
             sign = -1
 
-        cur = start
-        count = 0
-        while cur <= end:
-            if (inclusive or (start < cur < end)) and self.is_business_day(cur):
-                count += 1
-            cur += timedelta(days=1)
+        # busday_count counts [begin, end)
+        if inclusive:
+            begin, stop = start, end + timedelta(days=1)
+        else:
+            begin, stop = start + timedelta(days=1), end
+        count = int(np.busday_count(
+            np.datetime64(begin, "D"), np.datetime64(stop, "D"), busdaycal=self._np_cal
+        ))
 
         return count * (sign if signed else 1)
 
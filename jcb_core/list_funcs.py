@@ -1,5 +1,6 @@
 import os
 import ast
+from concurrent.futures import ProcessPoolExecutor
 
 # Change this to the root of your project
 PROJECT_ROOT = "./"   # e.g. "./bond_project" or "./jcb_analytics"
@@ -15,38 +16,48 @@ def parse_file(path):
             return {"error": f"SyntaxError: {e}"}
 
     funcs, classes = [], []
-    for node in ast.walk(tree):
+    # Module- and class-level definitions only: walk the bodies, not every node in the tree
+    for node in tree.body:
         if isinstance(node, ast.FunctionDef):
             funcs.append(node.name)
         elif isinstance(node, ast.ClassDef):
             classes.append(node.name)
+            funcs.extend(sub.name for sub in node.body if isinstance(sub, ast.FunctionDef))
     return {"functions": sorted(funcs), "classes": sorted(classes)}
 
-summary = []
-
-for root, dirs, files in os.walk(PROJECT_ROOT):
-    for file in files:
-        if file.endswith(".py"):
-            path = os.path.join(root, file)
-            relpath = os.path.relpath(path, PROJECT_ROOT)
-            info = parse_file(path)
-            summary.append((relpath, info))
-
-# Write to text file
-with open(output_file, "w", encoding="utf-8") as f:
-    for relpath, info in summary:
-        f.write(f"=== {relpath} ===\n")
-        if "error" in info:
-            f.write(f"  {info['error']}\n\n")
-            continue
-        if info["classes"]:
-            f.write("  Classes:\n")
-            for c in info["classes"]:
-                f.write(f"    - {c}\n")
-        if info["functions"]:
-            f.write("  Functions:\n")
-            for fn in info["functions"]:
-                f.write(f"    - {fn}\n")
-        f.write("\n")
-
-print(f"Project structure written to {output_file}")
\ No newline at end of file
+def main():
+    # Collect paths first, then parse in parallel (AST parsing is pure CPU)
+    relpaths, paths = [], []
+    for root, dirs, files in os.walk(PROJECT_ROOT):
+        for file in files:
+            if file.endswith(".py"):
+                path = os.path.join(root, file)
+                paths.append(path)
+                relpaths.append(os.path.relpath(path, PROJECT_ROOT))
+
+    with ProcessPoolExecutor() as ex:
+        summary = list(zip(relpaths, ex.map(parse_file, paths, chunksize=16)))
+
+    # Write to text file
+    with open(output_file, "w", encoding="utf-8") as f:
+        for relpath, info in summary:
+            f.write(f"=== {relpath} ===\n")
+            if "error" in info:
+                f.write(f"  {info['error']}\n\n")
+                continue
+            if info["classes"]:
+                f.write("  Classes:\n")
+                for c in info["classes"]:
+                    f.write(f"    - {c}\n")
+            if info["functions"]:
+                f.write("  Functions:\n")
+                for fn in info["functions"]:
+                    f.write(f"    - {fn}\n")
+            f.write("\n")
+
+    print(f"Project structure written to {output_file}")
+
+
+# Guarded so worker processes (spawned on macOS/Windows) don't re-run the scan on import
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,6 @@
 # classify_bond is_linker, is_greeen
 
 import re
-from fractions import Fraction
 
 # Unicode → ASCII
 UNICODE_FRACTIONS = {
@@ -12,40 +11,61 @@ UNICODE_FRACTIONS = {
     '⅛': '1/8', '⅜': '3/8', '⅝': '5/8', '⅞': '7/8'
 }
 
+# ASCII → decimal value (the regex only admits eighths, so no need to parse with Fraction)
+_FRAC_FLOAT = {f"{k}/8": k / 8 for k in range(1, 8)}
+_FRAC_FLOAT.update({'1/4': 0.25, '1/2': 0.5, '3/4': 0.75})
+
 # ASCII → short code letters
 FRACTION_MAP = {
     '1/8': 'e', '1/4': 'q', '3/8': 't',
     '1/2': 'h', '5/8': 'f', '3/4': 'r', '7/8': 's'
 }
 
-def parse_coupon_decimal(name: str) -> float:
-    match = re.match(r'(?:(\d+)\s+)?(\d+)?(?:\s*([¼½¾⅛⅜⅝⅞]|[1-7]/8))?%', name)
+# One pattern for both coupon and short code: whole number, optional fraction, '%',
+# then (optionally) the first 4-digit year in the name
+_COUPON_RE = re.compile(r'(?:(\d+)\s+)?(\d+)?(?:\s*([¼½¾⅛⅜⅝⅞]|[1-7]/8))?\s*%(?:.*?(\d{4}))?')
+
+def _coupon_parts(name: str):
+    """Run _COUPON_RE once; returns (number, ascii_fraction, year) or None."""
+    match = _COUPON_RE.match(name)
     if not match:
         return None
-    whole, leading, fraction = match.groups()
+    whole, leading, fraction, year = match.groups()
     number = whole if whole is not None else (leading if leading is not None else '0')
-    fraction_str = UNICODE_FRACTIONS.get(fraction, fraction)
+    return number, UNICODE_FRACTIONS.get(fraction, fraction), year
+
+def _coupon_from_parts(number: str, fraction_str) -> float:
     if fraction_str:
-        return float(number) + float(Fraction(fraction_str))
+        return float(number) + _FRAC_FLOAT[fraction_str]
     return float(number)
 
-def short_bond_code(name: str) -> str:
-    match = re.match(r'(?:(\d+)\s+)?(\d+)?(?:\s*([¼½¾⅛⅜⅝⅞]|[1-7]/8))?\s*%.*?(\d{4})', name)
-    if not match:
+def _short_code_from_parts(name_lower: str, number: str, fraction, year) -> str:
+    if year is None:
         return None
-    whole, leading, fraction, year = match.groups()
-    number = whole if whole is not None else (leading if leading is not None else '0')
-    fraction = UNICODE_FRACTIONS.get(fraction, fraction)
     letter = FRACTION_MAP.get(fraction or '', '_')
-    if "index-linked" in name.lower():
+    if "index-linked" in name_lower:
         return f"il{year[-2:]}"
     return f"{number}{letter}{year[-2:]}"
 
+def parse_coupon_decimal(name: str) -> float:
+    parts = _coupon_parts(name)
+    if not parts:
+        return None
+    number, fraction_str, _ = parts
+    return _coupon_from_parts(number, fraction_str)
+
+def short_bond_code(name: str) -> str:
+    parts = _coupon_parts(name)
+    if not parts:
+        return None
+    return _short_code_from_parts(name.lower(), *parts)
+
 def classify_bond(name: str):
     name_lower = name.lower()
+    parts = _coupon_parts(name)  # single regex pass shared by Short Code and Coupon
     return {
-        "Short Code": short_bond_code(name),
-        "Coupon": parse_coupon_decimal(name),
+        "Short Code": _short_code_from_parts(name_lower, *parts) if parts else None,
+        "Coupon": _coupon_from_parts(*parts[:2]) if parts else None,
         "Is Green": "green" in name_lower,
         "Is Linker": "index-linked" in name_lower,
         "Index Lag": (
@@ -53,4 +73,4 @@ def classify_bond(name: str):
             8 if "index-linked" in name_lower and "stock" in name_lower else
             None
         )
-    }
\ No newline at end of file
+    }
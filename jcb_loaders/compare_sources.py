@@ -14,28 +14,43 @@ def compare_source_series(
     sources: Sequence[str] = ("Bloomberg", "Tradeweb"),
     use_normalised: bool = True,
 ) -> pd.DataFrame:
-    table = "instrument_data" if use_normalised else "instrument_data"
+    table = "instruments_instrumentdata"
     with get_conn(db_path) as conn:
+        params = []
+        if sources:
+            # pivot in SQL: one row per date, one column per requested source
+            select_cols = ", ".join(
+                f"MAX(value) FILTER (WHERE source = %s) AS src_{i}" for i in range(len(sources))
+            )
+            params.extend(sources)
+        else:
+            select_cols = "source, value"
+
         sql = f"""
-        SELECT data_date, source, value
+        SELECT data_date, {select_cols}
         FROM {table}
-        WHERE instrument_id = ?
-          AND data_type = ?
+        WHERE instrument_id = %s
+          AND data_type = %s
         """
-        params = [isin, data_type]
+        params += [isin, data_type]
         if start:
-            sql += " AND data_date >= ?"; params.append(start)
+            sql += " AND data_date >= %s"; params.append(start)
         if end:
-            sql += " AND data_date <= ?"; params.append(end)
+            sql += " AND data_date <= %s"; params.append(end)
         if sources:
-            sql += " AND source IN ({})".format(",".join("?" for _ in sources))
-            params.extend(sources)
+            sql += " AND source = ANY(%s)"; params.append(list(sources))
+            sql += " GROUP BY data_date ORDER BY data_date"
         df = pd.read_sql_query(sql, conn, params=params, parse_dates=["data_date"])
 
     if df.empty:
         return df
 
-    pivot = df.pivot_table(index="data_date", columns="source", values="value", aggfunc="last").sort_index()
+    if sources:
+        pivot = df.set_index("data_date")
+        pivot.columns = pd.Index(list(sources), name="source")
+        pivot = pivot.dropna(axis=1, how="all")  # sources with no rows don't appear
+    else:
+        pivot = df.pivot_table(index="data_date", columns="source", values="value", aggfunc="last").sort_index()
     if set(sources).issubset(pivot.columns):
         pivot["diff"] = pivot[sources[1]] - pivot[sources[0]]
         # useful "bp" view for yields and prices
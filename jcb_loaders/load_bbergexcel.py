@@ -1,47 +1,59 @@
+from itertools import repeat
+
 import pandas as pd
-import sqlite3
-from jcb_bond_project.database.insert import insert_instrument_data
+from jcb_bond_project.database.db import DATABASE_URL, get_conn
+from jcb_bond_project.database.insert import normalise_data_type, upsert_instrument_data_rows
+
+# Arrow's multithreaded CSV reader from the `loaders` extra; falls back to pandas' C parser
+try:
+    import pyarrow
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = None
+
+# Map column name to data_type
+COLUMN_MAP = {
+    'Clean Price': 'price_clean',
+    'Dirty Price': 'price_dirty',
+    'Yield': 'yield',
+    'Mod Duration': 'duration_modified',
+    'Accrued Interest': 'accrued_interest',
+}
 
-def load_bberg_excel(file_path):
-    df = pd.read_csv(file_path)
+# Bloomberg's missing-value sentinels, turned into NaN by the CSV parser itself
+BBG_NA_VALUES = ["N/A", "#N/A", "n/a", "#N/A N/A", "#N/A Field Not Applicable", "#N/A Invalid Security"]
 
-    # Rename date column and parse it
-    df['Date'] = pd.to_datetime(df['Close of Business Date'], format="%d/%m/%Y").dt.date
+def load_bberg_excel(file_path, db_path: str = DATABASE_URL):
+    # value columns are typed as float64 by the parser (no per-column to_numeric pass)
+    df = pd.read_csv(
+        file_path,
+        engine=CSV_ENGINE,
+        na_values=BBG_NA_VALUES,
+        dtype={col: "float64" for col in COLUMN_MAP},
+    )
+
+    # Rename date column and parse it (cache=True: repeated dates are parsed once)
+    df['Date'] = pd.to_datetime(df['Close of Business Date'], format="%d/%m/%Y", cache=True).dt.date
     isin = df['ISIN'].iloc[0]
 
-    # Map column name to data_type
-    column_map = {
-        'Clean Price': 'price_clean',
-        'Dirty Price': 'price_dirty',
-        'Yield': 'yield',
-        'Mod Duration': 'duration_modified',
-        'Accrued Interest': 'accrued_interest',
-    }
-
-    conn = sqlite3.connect('jcb_db.db')
-    inserted, skipped = 0, 0
-
-    for _, row in df.iterrows():
-        for col, data_type in column_map.items():
-            value = row[col]
-            if pd.isna(value) or value == "N/A":
-                continue
-            try:
-                result = insert_instrument_data(
-                    conn,
-                    instrument_id=isin,
-                    data_date=row['Date'],
-                    data_type=data_type,
-                    value=float(value),
-                    source='Bloomberg',
-                    resolution='daily'
-                )
-                if result == "inserted":
-                    inserted += 1
-                else:
-                    skipped += 1
-            except Exception as e:
-                print(f"❌ Error on {row['Date']} ({data_type}): {e}")
-
-    conn.close()
-    print(f"✅ Finished: {inserted} inserted, {skipped} skipped.")
\ No newline at end of file
+    # wide -> long: one row per (date, data column), blanks dropped up front
+    value_cols = [c for c in COLUMN_MAP if c in df.columns]
+    long = df.melt(id_vars=['Date'], value_vars=value_cols, var_name='col', value_name='value')
+    skipped = int(long['value'].isna().sum())
+    long = long.dropna(subset=['value'])
+
+    # one transaction for the whole file instead of a commit per value
+    with get_conn(db_path) as conn:
+        # normalise each of the (few) data types once, not per value
+        types = {col: normalise_data_type(conn, 'Bloomberg', dt) for col, dt in COLUMN_MAP.items()}
+        data_type = long['col'].map({c: t[0] for c, t in types.items()})
+        unit = long['col'].map({c: t[1] for c, t in types.items()}).astype(object)
+        unit = unit.where(unit.notna(), None)
+        rows = zip(
+            repeat(isin), long['Date'], data_type, long['value'].tolist(),
+            repeat('Bloomberg'), repeat('daily'), unit, repeat("{}"),
+        )
+        inserted = upsert_instrument_data_rows(conn, rows)
+
+    print(f"✅ Finished: {inserted} inserted, {skipped} skipped.")
+    return inserted, skipped
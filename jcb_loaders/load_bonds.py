@@ -1,19 +1,47 @@
+import os
+from datetime import date, datetime
+
 import pandas as pd
-import sqlite3
 
+from jcb_bond_project.database.db import get_conn
 from jcb_bond_project.models.instrument import Instrument #Gets the class definition for Instrument from the models file
 from jcb_bond_project.models.instrument_data import InstrumentData
-from jcb_bond_project.database.insert import save_instrument #this is the function to load the instrument data to the database
-from jcb_bond_project.database.insert import insert_instrument_data
+from jcb_bond_project.database.insert import save_instruments_many #this is the function to load the instrument data to the database
+from jcb_bond_project.database.insert import insert_instrument_data_many
 from jcb_loaders.classify import classify_bond  #classify is a module that has some ways to filter and clean the spreadsheet information
 
 import re
 
 isin_pattern = re.compile(r'^[A-Z]{2}[A-Z0-9]{10}$')
 
+# Rust-based reader from the `loaders` extra; falls back to pandas' default engine
+try:
+    import python_calamine
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+# The only DMO sheet columns used downstream (before renaming)
+DMO_COLUMNS = {
+    "ISIN Code",
+    "Conventional Gilts",
+    "Redemption Date",
+    "First Issue Date",
+    "Total Amount in Issue \n(£ million nominal)",
+    "Amount in Issue incl Index Uplift",
+    "Unnamed: 7",
+}
+
 def is_isin(val):
     return isinstance(val, str) and bool(isin_pattern.match(val.strip()))
 
+def _to_date(val):
+    """Pass pre-parsed dates straight through; coerce anything else (None if unparseable)."""
+    if isinstance(val, date) and not isinstance(val, datetime):
+        return val
+    parsed = pd.to_datetime(val, errors='coerce')
+    return parsed.date() if pd.notna(parsed) else None
+
 def row_bond_to_instrument(row) -> Instrument: #The row of the spreadsheet is transformed into more enriched class Instrument data
     bond_name = row.get('Bond Name')
     isin = row.get('ISIN')
@@ -23,19 +51,19 @@ def row_bond_to_instrument(row) -> Instrument: #The row of the spreadsheet is tr
 
     info = classify_bond(bond_name) #the bond name is used for classifying features this is in the classify.py function
 
-    maturity = pd.to_datetime(row.get('Maturity Date'), errors='coerce')
-    issue = pd.to_datetime(row.get('Issue Date'), errors='coerce')
+    maturity = _to_date(row.get('Maturity Date'))
+    issue = _to_date(row.get('Issue Date'))
 
     return Instrument(
-        id=isin,
+        isin=isin,
         short_code=info['Short Code'],
         name=bond_name,
         instrument_type='bond',
         issuer='UK Government',
         country='UK',
         currency='GBP',
-        maturity_date=maturity.date() if pd.notna(maturity) else None,
-        first_issue_date=issue.date() if pd.notna(issue) else None,
+        maturity_date=maturity,
+        first_issue_date=issue,
         coupon_rate=info['Coupon'],
         is_green=info['Is Green'],
         is_linker=info['Is Linker'],
@@ -87,10 +115,9 @@ def row_bond_to_instrument_data(row, data_date) -> list[InstrumentData]:
 
 def load_bonds_from_excel(file_path, db_path):
     import re
-    from datetime import datetime
 
     # Read cell A1 to extract the date
-    metadata_df = pd.read_excel(file_path, header=None, nrows=1, usecols="A")
+    metadata_df = pd.read_excel(file_path, header=None, nrows=1, usecols="A", engine=EXCEL_ENGINE)
     match = re.search(r"Data Date:\s*(\d{1,2}-[A-Za-z]{3}-\d{4})", str(metadata_df.iloc[0, 0]))
     if match:
         data_date = datetime.strptime(match.group(1), "%d-%b-%Y").date()
@@ -99,7 +126,8 @@ def load_bonds_from_excel(file_path, db_path):
         raise ValueError("Could not extract data date from cell A1.")
 
     # Now read the full table starting from row 9 (header=8)
-    df = pd.read_excel(file_path, header=8)
+    # (callable usecols: columns missing from a given sheet are simply skipped)
+    df = pd.read_excel(file_path, header=8, engine=EXCEL_ENGINE, usecols=lambda c: c in DMO_COLUMNS)
     df = df.rename(columns={
         "ISIN Code": "ISIN",
         "Conventional Gilts": "Bond Name",
@@ -111,49 +139,43 @@ def load_bonds_from_excel(file_path, db_path):
 
     # Clean the ISINs
     df = df.dropna(subset=["ISIN"])
-    df = df[df["ISIN"].apply(is_isin)].copy()
+    mask = df["ISIN"].astype(str).str.strip().str.match(isin_pattern.pattern, na=False)
+    df = df.loc[mask].copy()
 
-    conn = sqlite3.connect(db_path)
+    # Parse the date columns once, vectorised, so row_bond_to_instrument just reads dates
+    for col in ("Maturity Date", "Issue Date"):
+        if col in df.columns:
+            parsed = pd.to_datetime(df[col], errors="coerce")
+            df[col] = parsed.dt.date.where(parsed.notna(), None)
 
-    # Counters
-    static_inserted = static_skipped = 0
-    dynamic_inserted = dynamic_skipped = 0
+    # Build every instrument / data point first, then write them in two batched upserts
+    instruments = []
+    data_points = []
     errors = []
 
-    for _, row in df.iterrows():
+    for row in df.to_dict("records"):
         try:
             # Static instrument
-            inst = row_bond_to_instrument(row)
-            result = save_instrument(conn, inst)
-            if result == "inserted":
-                static_inserted += 1
-            else:
-                static_skipped += 1
-
+            instruments.append(row_bond_to_instrument(row))
             # Dynamic data
-            instrument_data_list = row_bond_to_instrument_data(row, data_date)
-            for data_point in instrument_data_list:
-                result = insert_instrument_data(conn, data_point)
-                if result == "inserted":
-                    dynamic_inserted += 1
-                else:
-                    dynamic_skipped += 1
-
+            data_points.extend(row_bond_to_instrument_data(row, data_date))
         except Exception as e:
             errors.append(f"{row.get('ISIN', 'unknown ISIN')}: {e}")
 
-    conn.close()
+    with get_conn(db_path) as conn:
+        static_upserted = save_instruments_many(conn, instruments)
+        dynamic_upserted = insert_instrument_data_many(conn, data_points)
 
     # Summary
     print("✅ Static Instrument Data:")
-    print(f"   Inserted: {static_inserted}, Skipped: {static_skipped}")
+    print(f"   Upserted: {static_upserted}")
     print("📊 Dynamic Instrument Data:")
-    print(f"   Inserted: {dynamic_inserted}, Skipped: {dynamic_skipped}")
+    print(f"   Upserted: {dynamic_upserted}")
     print(f"⚠️ Errors: {len(errors)}")
     for err in errors:
         print(" -", err)
 
 if __name__ == "__main__":
     excel_file = "/Users/jcb/Documents/bond_project/dmo_data/20250529 - Gilts in Issue.xls"
-    db_path='jcb_db.db'
+    db_path = os.getenv("DATABASE_URL", "jcb_db.db")
     load_bonds_from_excel(excel_file, db_path)
\ No newline at end of file
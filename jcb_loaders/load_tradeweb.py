@@ -1,18 +1,20 @@
 from __future__ import annotations
 import json
-from dataclasses import fields as dc_fields
+from itertools import repeat
 from typing import Dict, Iterable, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from jcb_bond_project.database.db import get_conn
-from jcb_bond_project.models.instrument_data import InstrumentData
-from jcb_bond_project.database.insert import insert_instrument_data
+from jcb_bond_project.database.insert import copy_instrument_data_rows, upsert_instrument_data_rows
 
 DATE_COLS = ["Close of Business Date", "COB Date", "Date"]
 ISIN_COLS = ["ISIN", "Instrument", "Instrument ID"]
 
+# At or above this many values, stage via COPY instead of batched INSERTs
+COPY_MIN_ROWS = 20_000
+
 def _find_col(df: pd.DataFrame, candidates: Iterable[str]) -> str:
     norm = {c.strip().lower(): c for c in df.columns}
     for want in (c.strip().lower() for c in candidates):
@@ -34,22 +36,18 @@ def _fetch_mapping(conn, source: str) -> Dict[str, Tuple[str, Optional[str]]]:
     Returns dict: lower(raw_data_type) -> (canonical_data_type, default_unit)
     Prefers exact source over '*' wildcard.
     """
-    # wildcard first, then overwrite with source-specific
-    rows_star = conn.execute(
-        "SELECT raw_data_type, canonical_data_type, default_unit "
-        "FROM data_type_map WHERE source='*'"
-    ).fetchall()
-    rows_src = conn.execute(
-        "SELECT raw_data_type, canonical_data_type, default_unit "
-        "FROM data_type_map WHERE LOWER(source)=LOWER(?)",
-        (source,),
-    ).fetchall()
-
-    m: Dict[str, Tuple[str, Optional[str]]] = {
-        r[0].lower(): (r[1], r[2]) for r in rows_star
-    }
-    m.update({r[0].lower(): (r[1], r[2]) for r in rows_src})
-    return m
+    # one query: DISTINCT ON keeps the source-specific row ahead of the wildcard
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT ON (LOWER(raw_data_type))
+                   LOWER(raw_data_type), canonical_data_type, default_unit
+            FROM instruments_datatypemap
+            WHERE LOWER(source) = LOWER(%s) OR source = '*'
+            ORDER BY LOWER(raw_data_type), CASE WHEN source = '*' THEN 2 ELSE 1 END
+        """, (source,))
+        rows = cur.fetchall()
+
+    return {r[0]: (r[1], r[2]) for r in rows}
 
 def load_tradeweb_csv_mapped(
     file_path: str,
@@ -62,7 +60,8 @@ def load_tradeweb_csv_mapped(
 ) -> Tuple[int, int, int, int]:
     """
     Load a Tradeweb CSV using data_type_map to canonicalise on insert.
-    Returns (inserted, skipped, errors, unmapped_columns_count).
+    Returns (inserted, skipped, errors, unmapped_columns_count);
+    errors counts values dropped for a missing ISIN or unparseable date.
     """
     df = pd.read_csv(file_path)
     df.columns = [c.strip() for c in df.columns]
@@ -79,66 +78,57 @@ def load_tradeweb_csv_mapped(
     inserted = skipped = errors = 0
     unmapped_cols: set[str] = set()
 
+    # wide -> long: one row per (isin, date, data column), NaN cells dropped up front
+    long = df.melt(
+        id_vars=[isin_col, "_data_date"],
+        value_vars=data_cols,
+        var_name="raw_type",
+        value_name="value",
+    )
+    long["isin"] = long[isin_col].astype(str).str.strip()
+    has_value = long["value"].notna()
+    # mask missing ISINs explicitly: astype(str) turns them into 'nan' (or keeps NaN)
+    has_key = long[isin_col].notna() & (long["isin"] != "") & long["_data_date"].notna()
+    # values that can't be attributed to an instrument/date are reported as errors
+    errors = int((has_value & ~has_key).sum())
+    long = long[has_value & has_key]
+
     with get_conn(db_path) as conn:
         # build mapping once per run
         mapping = _fetch_mapping(conn, source)
 
-        # precompute InstrumentData fields so we can include unit/attrs if available
-        id_fields = {f.name for f in dc_fields(InstrumentData)}
-
-        for _, row in df.iterrows():
-            isin = str(row[isin_col]).strip()
-            d = row["_data_date"]
-            if not isin or pd.isna(d):
-                continue
-
-            for col in data_cols:
-                raw_type = col.strip()
-                val = row.get(col)
-                if pd.isna(val):
-                    continue
-
-                key = raw_type.lower()
-                if key in mapping:
-                    canonical, unit = mapping[key]
-                else:
-                    unmapped_cols.add(raw_type)
-                    if not allow_unmapped:
-                        continue
-                    canonical, unit = raw_type, None  # insert raw if allowed
-
-                try:
-                    value = float(str(val).replace(",", ""))
-                except Exception:
-                    continue
-
-                if dry_run:
-                    continue
-
-                kwargs = dict(
-                    instrument_id=isin,
-                    data_date=d,
-                    data_type=canonical,
-                    value=value,
-                    source=source,
-                    resolution=resolution,
-                )
-                # Include unit if InstrumentData supports it
-                if "unit" in id_fields and unit:
-                    kwargs["unit"] = unit
-                # Keep provenance if attrs exists
-                if "attrs" in id_fields:
-                    kwargs["attrs"] = json.dumps({"raw_type": raw_type})
-
-                try:
-                    rec = InstrumentData(**kwargs)
-                    res = insert_instrument_data(conn, rec)
-                    if res == "inserted":
-                        inserted += 1
-                    else:
-                        skipped += 1
-                except Exception:
-                    errors += 1
+        key = long["raw_type"].str.lower()
+        is_mapped = key.isin(mapping.keys())
+        unmapped_cols.update(long.loc[~is_mapped, "raw_type"].unique())
+        if not allow_unmapped:
+            long, key = long[is_mapped], key[is_mapped]
+        # unmapped columns (if allowed) are inserted with their raw name and no unit
+        long["data_type"] = key.map({k: v[0] for k, v in mapping.items()}).fillna(long["raw_type"])
+        long["unit"] = key.map({k: v[1] for k, v in mapping.items()})
+
+        # numeric parse in one pass ("1,234.5" -> 1234.5); unparseable cells are skipped
+        long["value"] = pd.to_numeric(
+            long["value"].astype(str).str.replace(",", "", regex=False), errors="coerce"
+        )
+        skipped = int(long["value"].isna().sum())
+        long = long.dropna(subset=["value"])
+
+        if not dry_run:
+            # Bind columns straight into the upsert: types are already canonical here,
+            # so skip InstrumentData construction and the per-type normalise lookup
+            attrs = long["raw_type"].map({  # keep provenance
+                rt: json.dumps({"raw_type": rt}, separators=(",", ":"))
+                for rt in long["raw_type"].unique()
+            })
+            unit = long["unit"].astype(object).where(long["unit"].notna(), None)
+            rows = zip(
+                long["isin"], long["_data_date"], long["data_type"], long["value"].tolist(),
+                repeat(source), repeat(resolution), unit, attrs,
+            )
+            if len(long) >= COPY_MIN_ROWS:
+                inserted = copy_instrument_data_rows(conn, rows)
+            else:
+                inserted = upsert_instrument_data_rows(conn, rows)
 
     if unmapped_cols:
         print("⚠️ Unmapped Tradeweb columns (add aliases in data_type_map):")
@@ -1,6 +1,6 @@
-from core.startup import setup_database, validate_database_schema
-
 if __name__ == "__main__":
+    from core.startup import setup_database, validate_database_schema
+
     db_path="jcb_db.db"
     setup_database(db_path)
     validate_database_schema(db_path)
\ No newline at end of file
@@ -0,0 +1,45 @@
+import pytest
+
+from jcb_loaders.classify import classify_bond, parse_coupon_decimal, short_bond_code
+
+
+# --- Short Code / Coupon ---
+@pytest.mark.parametrize("name, short_code, coupon", [
+    ("4⅛% Treasury Gilt 2030", "4e30", 4.125),            # unicode eighth
+    ("4 1/8% Treasury Gilt 2030", "4e30", 4.125),         # ASCII eighth
+    ("0⅜% Treasury Gilt 2026", "0t26", 0.375),
+    ("3⅝% Treasury Gilt 2031", "3f31", 3.625),
+    ("0 7/8% Green Gilt 2033", "0s33", 0.875),
+    ("1 5/8% Green Gilt 2054", "1f54", 1.625),
+    ("½% Treasury Gilt 2061", "0h61", 0.5),               # no whole number
+    ("1½% Treasury Gilt 2047", "1h47", 1.5),
+    ("4¼% Treasury Gilt 2034", "4q34", 4.25),
+    ("3¾% Treasury Gilt 2038", "3r38", 3.75),
+    ("5% Treasury Stock 2025", "5_25", 5.0),               # no fraction
+    ("10% Treasury Stock 2025", "10_25", 10.0),
+    ("1¼% Index-linked Treasury Gilt 2027", "il27", 1.25),
+    ("0⅛% Index-linked Treasury Gilt 2068", "il68", 0.125),
+    ("3% Treasury Gilt", None, 3.0),                       # no year
+    ("Treasury Gilt 2030", None, None),                    # no '%'
+    ("4½ % Gilt 2030", "4h30", 4.5),                       # space before '%'
+])
+def test_short_code_and_coupon(name, short_code, coupon):
+    result = classify_bond(name)
+    assert result["Short Code"] == short_code
+    assert result["Coupon"] == coupon
+    assert short_bond_code(name) == short_code
+    assert parse_coupon_decimal(name) == coupon
+
+
+# --- Flags ---
+@pytest.mark.parametrize("name, is_green, is_linker, index_lag", [
+    ("4⅛% Treasury Gilt 2030", False, False, None),
+    ("0 7/8% Green Gilt 2033", True, False, None),
+    ("1¼% Index-linked Treasury Gilt 2027", False, True, 3),
+    ("2½% Index-linked Treasury Stock 2024", False, True, 8),
+])
+def test_flags(name, is_green, is_linker, index_lag):
+    result = classify_bond(name)
+    assert result["Is Green"] is is_green
+    assert result["Is Linker"] is is_linker
+    assert result["Index Lag"] == index_lag
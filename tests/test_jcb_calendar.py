@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+
+from jcb_bond_project.utils.jcb_calendar import BusinessDayCalendar
+
+# Christmas / Boxing Day 2024 (Wed/Thu) and New Year's Day 2025 (Wed)
+HOLIDAYS = [date(2024, 12, 25), date(2024, 12, 26), date(2025, 1, 1)]
+
+
+@pytest.fixture(scope="module")
+def cal():
+    return BusinessDayCalendar(HOLIDAYS)
+
+
+# --- workday ---
+@pytest.mark.parametrize("start, days, expected", [
+    (date(2024, 12, 28), 1, date(2024, 12, 30)),   # Sat +1 -> Mon
+    (date(2024, 12, 28), -1, date(2024, 12, 27)),  # Sat -1 -> Fri
+    (date(2024, 12, 28), 0, date(2024, 12, 30)),   # Sat 0 -> next biz day
+    (date(2024, 12, 25), 1, date(2024, 12, 27)),   # holiday +1 skips Boxing Day
+    (date(2024, 12, 25), -1, date(2024, 12, 24)),
+    (date(2024, 12, 25), 0, date(2024, 12, 27)),
+    (date(2024, 12, 27), 0, date(2024, 12, 27)),   # biz day 0 -> itself
+    (date(2024, 12, 31), 1, date(2025, 1, 2)),     # across year end + holiday
+    (date(2025, 1, 2), -1, date(2024, 12, 31)),
+    (date(2024, 12, 23), 3, date(2024, 12, 30)),
+])
+def test_workday(cal, start, days, expected):
+    assert cal.workday(start, days) == expected
+
+
+def test_next_previous_business_day(cal):
+    assert cal.next_business_day(date(2024, 12, 24)) == date(2024, 12, 27)
+    assert cal.previous_business_day(date(2024, 12, 27)) == date(2024, 12, 24)
+
+
+# --- business_days_between ---
+@pytest.mark.parametrize("a, b, inclusive, signed, expected", [
+    (date(2024, 12, 24), date(2025, 1, 2), False, True, 3),   # 27, 30, 31
+    (date(2024, 12, 24), date(2025, 1, 2), True, True, 5),    # + both ends
+    (date(2025, 1, 2), date(2024, 12, 24), False, True, -3),
+    (date(2025, 1, 2), date(2024, 12, 24), False, False, 3),
+    (date(2025, 1, 2), date(2024, 12, 24), True, True, -5),
+    (date(2024, 12, 28), date(2024, 12, 30), False, True, 0),  # Sat start, only Sun between
+    (date(2024, 12, 28), date(2024, 12, 30), True, True, 1),   # Mon counted
+    (date(2024, 12, 27), date(2024, 12, 27), True, True, 1),
+    (date(2024, 12, 27), date(2024, 12, 27), False, True, 0),
+    (date(2024, 12, 25), date(2024, 12, 25), True, True, 0),   # holiday
+])
+def test_business_days_between(cal, a, b, inclusive, signed, expected):
+    assert cal.business_days_between(a, b, inclusive=inclusive, signed=signed) == expected
+
+
+# --- adjust / adjust_many ---
+@pytest.mark.parametrize("d, convention, expected", [
+    (date(2024, 8, 31), "f", date(2024, 9, 2)),     # Sat month end
+    (date(2024, 8, 31), "p", date(2024, 8, 30)),
+    (date(2024, 8, 31), "mf", date(2024, 8, 30)),   # following would leave August
+    (date(2024, 6, 1), "f", date(2024, 6, 3)),      # Sat month start
+    (date(2024, 6, 1), "p", date(2024, 5, 31)),
+    (date(2024, 6, 1), "mf", date(2024, 6, 3)),
+    (date(2024, 12, 28), "mf", date(2024, 12, 30)),
+    (date(2025, 1, 1), "f", date(2025, 1, 2)),      # holiday
+    (date(2025, 1, 1), "p", date(2024, 12, 31)),
+    (date(2025, 1, 1), "mf", date(2025, 1, 2)),
+    (date(2024, 12, 27), "mf", date(2024, 12, 27)),  # already a biz day
+])
+def test_adjust(cal, d, convention, expected):
+    assert cal.adjust(d, convention) == expected
+    assert list(cal.adjust_many([d], convention).astype(object)) == [expected]
+
+
+def test_adjust_rejects_unknown_convention(cal):
+    with pytest.raises(ValueError):
+        cal.adjust(date(2024, 8, 31), "x")
+    with pytest.raises(ValueError):
+        cal.adjust_many([date(2024, 8, 31)], "x")
+
+
+def test_is_business_day(cal):
+    assert cal.is_business_day(date(2024, 12, 24))
+    assert not cal.is_business_day(date(2024, 12, 25))   # holiday
+    assert not cal.is_business_day(date(2024, 12, 28))   # Saturday
+    assert cal.is_business_day(date(2030, 1, 2))         # beyond the holiday range
+
+
+def test_are_business_days_matches_scalar(cal):
+    days = [date(2024, 12, 20 + i) for i in range(12)] + [date(2020, 1, 1), date(2030, 1, 2)]
+    expected = [cal.is_business_day(d) for d in days]
+    assert cal.are_business_days([d.toordinal() for d in days]).tolist() == expected
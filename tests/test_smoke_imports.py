@@ -1,16 +1,26 @@
-def test_imports_and_functions():
-    # --- Database ---
+import datetime
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def conn():
+    # built once per worker session rather than per test
     from jcb_bond_project.database.db import get_conn
-    conn = get_conn(":memory:")   # sqlite in-memory db
+    return get_conn(":memory:")
+
+
+# --- Database ---
+def test_database(conn):
     assert conn is not None
 
     from jcb_bond_project.database.query import _coerce_date
-    import datetime
     assert _coerce_date(datetime.date.today()) == datetime.date.today()
 
-    # --- Cashflow model ---
+
+# --- Cashflow model ---
+def test_cashflow_model():
     from jcb_bond_project.cashflow_model.conv_bond_model import CashflowModel
-    import datetime
 
     today = datetime.date.today()
     future = datetime.date(2030, 1, 1)
@@ -28,20 +38,27 @@ def test_imports_and_functions():
     assert isinstance(schedule, list)
 
 
-    # --- Calendar utils ---
+# --- Calendar utils ---
+def test_calendar_utils():
     from jcb_bond_project.utils.jcb_calendar import BusinessDayCalendar
     cal = BusinessDayCalendar([])
     assert cal.is_business_day(datetime.date.today()) in (True, False)
 
-    # --- Identifiers ---
+
+# --- Identifiers ---
+def test_identifiers():
     from jcb_bond_project.utils.identifiers import generate_jcb_isin
     isin = generate_jcb_isin("GBP", "BOND1","10Y")
     assert isin.startswith("JCB")
 
-    # --- Portfolio ---
+
+# --- Portfolio ---
+def test_portfolio():
     import jcb_bond_project.portfolio.portfolio_builders
     assert hasattr(jcb_bond_project.portfolio.portfolio_builders, "build_portfolio")
 
-    # --- Analytics ---
+
+# --- Analytics ---
+def test_analytics():
     import jcb_bond_project.jcb_analytics.jcb_analytics
     assert hasattr(jcb_bond_project.jcb_analytics.jcb_analytics, "jGet_Instrument_Data")